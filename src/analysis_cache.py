@@ -0,0 +1,71 @@
+"""
+Analysis Cache Module
+
+Persists Claude results in SQLite so re-runs skip API calls for papers
+that have already been analyzed.
+"""
+
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+# Default location of the cache database
+DEFAULT_CACHE_PATH = Path(".cache/analyses.sqlite3")
+
+
+class AnalysisCache:
+    """SQLite-backed cache of JSON results keyed by SHA-256 digests."""
+    
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        ttl_seconds: Optional[int] = None,
+    ):
+        """
+        Initialize the analysis cache.
+        
+        Args:
+            path: SQLite database file (created if missing)
+            ttl_seconds: Maximum age of a cached entry (None to never expire)
+        """
+        self.ttl_seconds = ttl_seconds
+        
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Analyses run in worker threads, so share one connection behind a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, json TEXT NOT NULL, created_at INTEGER NOT NULL)"
+            )
+    
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the parts that determine a result."""
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached JSON for a key, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT json, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        if self.ttl_seconds is not None and row[1] < time.time() - self.ttl_seconds:
+            return None
+        return row[0]
+    
+    def set(self, key: str, value: str) -> None:
+        """Store JSON for a key, replacing any existing entry."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, json, created_at) VALUES (?, ?, ?)",
+                (key, value, int(time.time())),
+            )
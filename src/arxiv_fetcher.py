@@ -4,14 +4,20 @@ ArXiv Fetcher Module
 Fetches recent papers from arXiv across multiple CS categories.
 """
 
-import arxiv
-from datetime import datetime, timedelta
-from typing import Optional
+import json
+import time
+import asyncio
+import aiohttp
+import xml.etree.ElementTree as ET
+from datetime import date, datetime, timedelta, timezone
+from io import BytesIO
+from pathlib import Path
+from typing import Iterator, Optional
 from dataclasses import dataclass, field
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Paper:
     """Represents an arXiv paper with relevant metadata."""
     
@@ -25,6 +31,15 @@ class Paper:
     updated: datetime
     arxiv_url: str
     pdf_url: str
+    authors_string: str = field(init=False, repr=False, compare=False)
+    abstract_preview: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Derive these once; frozen slots rule out functools.cached_property
+        object.__setattr__(self, "authors_string", ", ".join(self.authors))
+        # Abstract truncated to 500 characters, as shown when ranking papers
+        preview = self.abstract if len(self.abstract) <= 500 else self.abstract[:500] + "..."
+        object.__setattr__(self, "abstract_preview", preview)
     
     def to_dict(self) -> dict:
         """Convert paper to dictionary for serialization."""
@@ -40,6 +55,17 @@ class Paper:
             "arxiv_url": self.arxiv_url,
             "pdf_url": self.pdf_url,
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "Paper":
+        """Create a paper from a dictionary produced by to_dict."""
+        return cls(
+            **{
+                **data,
+                "published": datetime.fromisoformat(data["published"]),
+                "updated": datetime.fromisoformat(data["updated"]),
+            }
+        )
 
 
 # Category mapping for human-readable names
@@ -54,6 +80,35 @@ CATEGORY_NAMES = {
 # Default categories to monitor
 DEFAULT_CATEGORIES = ["cs.AI", "cs.LG", "cs.CL", "cs.CV", "cs.RO"]
 
+# arXiv export API endpoint
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+
+# Most results the arXiv API returns from a single call
+ARXIV_MAX_RESULTS = 2000
+
+# Namespaced tags in the arXiv Atom feed
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ARXIV_NS = "{http://arxiv.org/schemas/atom}"
+ATOM_ENTRY = f"{ATOM_NS}entry"
+ATOM_ID = f"{ATOM_NS}id"
+ATOM_TITLE = f"{ATOM_NS}title"
+ATOM_SUMMARY = f"{ATOM_NS}summary"
+ATOM_AUTHOR = f"{ATOM_NS}author"
+ATOM_NAME = f"{ATOM_NS}name"
+ATOM_LINK = f"{ATOM_NS}link"
+ATOM_CATEGORY = f"{ATOM_NS}category"
+ATOM_PUBLISHED = f"{ATOM_NS}published"
+ATOM_UPDATED = f"{ATOM_NS}updated"
+ARXIV_PRIMARY_CATEGORY = f"{ARXIV_NS}primary_category"
+
+# On-disk cache of fetched papers, reused by reruns within the TTL
+CACHE_DIR = Path(".cache/arxiv")
+CACHE_TTL_SECONDS = 3600
+
+# Time of the last successful fetch per cache entry, sent as If-Modified-Since
+LAST_FETCH_PATH = CACHE_DIR / "last_fetch.json"
+HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
+
 
 class ArxivFetcher:
     """Fetches and filters papers from arXiv."""
@@ -72,16 +127,7 @@ class ArxivFetcher:
         """
         self.categories = categories or DEFAULT_CATEGORIES
         self.max_results_per_category = max_results_per_category
-        self.client = arxiv.Client(
-            page_size=100,
-            delay_seconds=3.0,  # Be respectful to arXiv API
-            num_retries=3,
-        )
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
     def fetch_recent_papers(
         self,
         days_back: int = 1,
@@ -90,6 +136,23 @@ class ArxivFetcher:
         """
         Fetch recent papers from arXiv.
         
+        Args:
+            days_back: How many days back to look for papers
+            categories: Override default categories for this fetch
+            
+        Returns:
+            List of Paper objects
+        """
+        return asyncio.run(self.fetch_recent_papers_async(days_back, categories))
+    
+    async def fetch_recent_papers_async(
+        self,
+        days_back: int = 1,
+        categories: list[str] = None,
+    ) -> list[Paper]:
+        """
+        Fetch recent papers from arXiv with a single query across all categories.
+        
         Args:
             days_back: How many days back to look for papers
             categories: Override default categories for this fetch
@@ -98,67 +161,126 @@ class ArxivFetcher:
             List of Paper objects
         """
         categories = categories or self.categories
-        all_papers: dict[str, Paper] = {}  # Use dict to deduplicate by arxiv_id
         
-        for category in categories:
-            papers = self._fetch_category(category, days_back)
-            for paper in papers:
-                # Deduplicate - papers can appear in multiple categories
-                if paper.arxiv_id not in all_papers:
-                    all_papers[paper.arxiv_id] = paper
+        # One OR query returns each cross-listed paper once, not once per category.
+        # arXiv filters by submission date server-side, so only recent papers are sent.
+        now = datetime.now(timezone.utc)
+        start = (now - timedelta(days=days_back + 1)).strftime("%Y%m%d%H%M")  # +1 for timezone buffer
+        end = now.strftime("%Y%m%d%H%M")
+        category_query = " OR ".join(f"cat:{c}" for c in categories)
+        query = f"({category_query}) AND submittedDate:[{start} TO {end}]"
+        max_results = self.max_results_per_category * len(categories)
         
-        # Sort by published date (newest first)
-        sorted_papers = sorted(
-            all_papers.values(),
-            key=lambda p: p.published,
-            reverse=True,
-        )
+        cache = self._cache_path(categories, days_back, max_results)
+        if cache.exists() and cache.stat().st_mtime > time.time() - CACHE_TTL_SECONDS:
+            papers = [Paper.from_dict(d) for d in json.loads(cache.read_text())]
+            print(f"Loaded {len(papers)} cached papers across {len(categories)} categories")
+            return papers
         
-        print(f"Fetched {len(sorted_papers)} unique papers across {len(categories)} categories")
-        return sorted_papers
-    
-    def _fetch_category(self, category: str, days_back: int) -> list[Paper]:
-        """Fetch papers from a specific category."""
-        # Build search query for recent papers in this category
-        search = arxiv.Search(
-            query=f"cat:{category}",
-            max_results=self.max_results_per_category,
-            sort_by=arxiv.SortCriterion.SubmittedDate,
-            sort_order=arxiv.SortOrder.Descending,
-        )
+        # Revalidate an expired cache entry with a conditional GET
+        last_fetch = self._load_last_fetch()
+        headers = {}
+        if cache.exists() and cache.name in last_fetch:
+            last_modified = datetime.fromisoformat(last_fetch[cache.name])
+            headers["If-Modified-Since"] = last_modified.strftime(HTTP_DATE_FORMAT)
         
-        papers = []
-        cutoff_date = datetime.now() - timedelta(days=days_back + 1)  # +1 for timezone buffer
+        async with aiohttp.ClientSession() as session:
+            papers = await self._fetch_query(session, query, max_results, headers)
         
-        try:
-            for result in self.client.results(search):
-                # Filter by date - only include papers from the last N days
-                # Note: arxiv published dates are timezone-naive
-                published_date = result.published.replace(tzinfo=None)
-                if published_date < cutoff_date:
-                    continue
-                
-                paper = Paper(
-                    arxiv_id=result.entry_id.split("/")[-1],  # Extract ID from URL
-                    title=result.title.replace("\n", " ").strip(),
-                    authors=[author.name for author in result.authors],
-                    abstract=result.summary.replace("\n", " ").strip(),
-                    categories=result.categories,
-                    primary_category=result.primary_category,
-                    published=result.published,
-                    updated=result.updated,
-                    arxiv_url=result.entry_id,
-                    pdf_url=result.pdf_url,
-                )
-                papers.append(paper)
-                
-        except Exception as e:
-            print(f"Error fetching category {category}: {e}")
-            raise
+        if papers is None:
+            cache.touch()  # Restart the TTL for the revalidated entry
+            papers = [Paper.from_dict(d) for d in json.loads(cache.read_text())]
+            print(f"Not modified: loaded {len(papers)} cached papers across {len(categories)} categories")
+            return papers
         
-        print(f"  {category}: {len(papers)} papers")
+        # Sort by published date (newest first)
+        papers.sort(key=lambda p: p.published, reverse=True)
+        
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        cache.write_text(json.dumps([p.to_dict() for p in papers]))
+        last_fetch[cache.name] = now.isoformat()
+        LAST_FETCH_PATH.write_text(json.dumps(last_fetch))
+        
+        print(f"Fetched {len(papers)} unique papers across {len(categories)} categories")
         return papers
     
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+    )
+    async def _fetch_query(
+        self,
+        session: aiohttp.ClientSession,
+        query: str,
+        max_results: int,
+        headers: dict = None,
+    ) -> Optional[list[Paper]]:
+        """
+        Fetch papers matching a search query with a single API request.
+        
+        Returns None if the server reports the results as not modified.
+        """
+        # One request per run keeps within arXiv's one-request-every-3-seconds policy
+        params = {
+            "search_query": query,
+            "sortBy": "submittedDate",
+            "sortOrder": "descending",
+            "start": 0,
+            "max_results": min(max_results, ARXIV_MAX_RESULTS),
+        }
+        
+        async with session.get(ARXIV_API_URL, params=params, headers=headers) as resp:
+            if resp.status == 304:
+                return None
+            resp.raise_for_status()
+            data = await resp.read()
+        
+        return list(self._parse_feed(data))
+    
+    def _load_last_fetch(self) -> dict[str, str]:
+        """Load the last successful fetch times, keyed by cache file name."""
+        if not LAST_FETCH_PATH.exists():
+            return {}
+        return json.loads(LAST_FETCH_PATH.read_text())
+    
+    def _cache_path(self, categories: list[str], days_back: int, max_results: int) -> Path:
+        """Get the cache file for papers fetched today with these query parameters."""
+        return CACHE_DIR / f"{date.today()}_{'+'.join(categories)}_{days_back}_{max_results}.json"
+    
+    def _parse_feed(self, data: bytes) -> Iterator[Paper]:
+        """Stream-parse an Atom feed, yielding a Paper per entry."""
+        for _, elem in ET.iterparse(BytesIO(data), events=("end",)):
+            if elem.tag == ATOM_ENTRY:
+                yield self._parse_entry(elem)
+                elem.clear()
+    
+    def _parse_entry(self, entry: ET.Element) -> Paper:
+        """Convert an Atom <entry> element into a Paper."""
+        entry_id = entry.findtext(ATOM_ID).strip()
+        pdf_url = next(
+            (link.get("href") for link in entry.iterfind(ATOM_LINK) if link.get("title") == "pdf"),
+            entry_id.replace("/abs/", "/pdf/"),
+        )
+        categories = [tag.get("term") for tag in entry.iterfind(ATOM_CATEGORY)]
+        primary = entry.find(ARXIV_PRIMARY_CATEGORY)
+        primary_category = (
+            primary.get("term") if primary is not None
+            else categories[0] if categories else ""
+        )
+        
+        return Paper(
+            arxiv_id=entry_id.split("/")[-1],  # Extract ID from URL
+            title=entry.findtext(ATOM_TITLE, "").replace("\n", " ").strip(),
+            authors=[author.findtext(ATOM_NAME, "") for author in entry.iterfind(ATOM_AUTHOR)],
+            abstract=entry.findtext(ATOM_SUMMARY, "").replace("\n", " ").strip(),
+            categories=categories,
+            primary_category=primary_category,
+            published=datetime.fromisoformat(entry.findtext(ATOM_PUBLISHED)),
+            updated=datetime.fromisoformat(entry.findtext(ATOM_UPDATED)),
+            arxiv_url=entry_id,
+            pdf_url=pdf_url,
+        )
+    
     def fetch_todays_papers(self) -> list[Paper]:
         """Convenience method to fetch today's papers."""
         return self.fetch_recent_papers(days_back=1)
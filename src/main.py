@@ -3,25 +3,79 @@ ArXiv AI Research Agent - Main Orchestrator
 
 This script orchestrates the full pipeline:
 1. Fetch recent papers from arXiv
-2. Analyze and rank papers using Claude
-3. Add top papers to Notion database
-4. Create daily summary page
+2. Analyze and rank papers using Claude, adding each top paper to the
+   Notion database as soon as its analysis completes
+3. Create daily summary page
 """
 
 import os
 import sys
+import argparse
+import asyncio
+from contextlib import nullcontext
 from datetime import datetime
+from typing import Optional
 from dotenv import load_dotenv
 
-from .arxiv_fetcher import ArxivFetcher
-from .paper_analyzer import PaperAnalyzer
+from .arxiv_fetcher import ArxivFetcher, Paper
+from .paper_analyzer import AnalyzedPaper, PaperAnalyzer, sort_by_score
 from .notion_client import NotionClient
 
 
+async def analyze_and_add_papers(
+    analyzer: PaperAnalyzer,
+    notion: Optional[NotionClient],
+    papers: list[Paper],
+    max_papers: int,
+) -> tuple[list[AnalyzedPaper], list[str]]:
+    """
+    Analyze papers and add each one to Notion as soon as its analysis completes.
+    
+    Notion inserts run while Claude analyzes the next paper, instead of waiting
+    for the whole analysis pass to finish.
+    
+    Args:
+        analyzer: Analyzer used to rank and summarize papers
+        notion: Notion client to add papers with (None to skip Notion)
+        papers: Fetched papers to analyze
+        max_papers: Maximum number of top papers to analyze in detail
+        
+    Returns:
+        Tuple of (analyzed papers sorted by innovation score, added page IDs)
+    """
+    store = notion is not None and bool(notion.database_id)
+    if store:
+        # Skip papers already in the database before paying for their analysis
+        existing = await asyncio.to_thread(
+            notion._existing_arxiv_ids, [p.arxiv_id for p in papers]
+        )
+        if existing:
+            print(f"Skipping {len(existing)} papers already in the database")
+            papers = [p for p in papers if p.arxiv_id not in existing]
+    
+    analyzed_papers = []
+    tasks = []
+    
+    async with (notion.create_session() if store else nullcontext()) as session:
+        async with asyncio.TaskGroup() as tg:
+            async for ap in analyzer.analyze_papers_stream(papers, max_papers=max_papers):
+                analyzed_papers.append(ap)
+                if store:
+                    tasks.append(tg.create_task(notion.add_paper_async(session, ap)))
+    
+    page_ids = [task.result() for task in tasks if task.result()]
+    
+    # Sort by innovation score (highest first)
+    sort_by_score(analyzed_papers)
+    
+    return analyzed_papers, page_ids
+
+
 def run_daily_pipeline(
     days_back: int = 1,
     max_papers: int = 15,
     dry_run: bool = False,
+    lightweight: bool = False,
 ) -> dict:
     """
     Run the complete daily pipeline.
@@ -30,6 +84,8 @@ def run_daily_pipeline(
         days_back: How many days of papers to fetch
         max_papers: Maximum number of top papers to analyze in detail
         dry_run: If True, skip Notion operations (for testing)
+        lightweight: If True, skip per-paper database rows and only create the
+            daily summary page, which already links every analyzed paper
         
     Returns:
         Dictionary with run statistics
@@ -66,15 +122,22 @@ def run_daily_pipeline(
         print("No papers found. Exiting.")
         return stats
     
-    # Step 2: Analyze papers with Claude
+    # Step 2: Analyze papers with Claude, adding each to Notion as it completes
     print("Step 2: Analyzing papers with Claude...")
     print("-" * 40)
     
     try:
         analyzer = PaperAnalyzer()
-        analyzed_papers = analyzer.analyze_papers(papers, max_papers=max_papers)
+        notion = None if dry_run else NotionClient()
+        database = None if lightweight else notion
+        analyzed_papers, page_ids = asyncio.run(
+            analyze_and_add_papers(analyzer, database, papers, max_papers)
+        )
         stats["papers_analyzed"] = len(analyzed_papers)
+        stats["papers_added"] = len(page_ids)
         print(f"\nAnalyzed {len(analyzed_papers)} top papers\n")
+        if database is not None:
+            print(f"Added {len(page_ids)} new papers to database\n")
     except Exception as e:
         error_msg = f"Error analyzing papers: {e}"
         print(error_msg)
@@ -96,22 +159,8 @@ def run_daily_pipeline(
         print("DRY RUN: Skipping Notion operations\n")
         return stats
     
-    # Step 3: Add papers to Notion database
-    print("Step 3: Adding papers to Notion database...")
-    print("-" * 40)
-    
-    try:
-        notion = NotionClient()
-        page_ids = notion.add_papers_to_database(analyzed_papers)
-        stats["papers_added"] = len(page_ids)
-        print(f"\nAdded {len(page_ids)} new papers to database\n")
-    except Exception as e:
-        error_msg = f"Error adding papers to Notion: {e}"
-        print(error_msg)
-        stats["errors"].append(error_msg)
-    
-    # Step 4: Create daily summary page
-    print("Step 4: Creating daily summary page...")
+    # Step 3: Create daily summary page
+    print("Step 3: Creating daily summary page...")
     print("-" * 40)
     
     try:
@@ -153,6 +202,18 @@ def run_daily_pipeline(
 
 def main():
     """Main entry point."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="ArXiv AI Research Agent")
+    parser.add_argument("--dry-run", action="store_true", help="Skip Notion operations")
+    parser.add_argument("--days", type=int, default=1, help="How many days of papers to fetch")
+    parser.add_argument("--max", type=int, default=15, help="Maximum number of top papers to analyze")
+    parser.add_argument(
+        "--lightweight",
+        action="store_true",
+        help="Only create the daily summary page, without per-paper database rows",
+    )
+    args = parser.parse_args()
+    
     # Load environment variables
     load_dotenv()
     
@@ -174,32 +235,12 @@ def main():
         print("Warning: NOTION_PARENT_PAGE_ID not set. Daily summaries will not be created.")
         print("Please set this to the ID of your ArXiv AI Research Agent page.\n")
     
-    # Parse command line arguments
-    dry_run = "--dry-run" in sys.argv
-    
-    # Check for days argument
-    days_back = 1
-    for arg in sys.argv:
-        if arg.startswith("--days="):
-            try:
-                days_back = int(arg.split("=")[1])
-            except ValueError:
-                pass
-    
-    # Check for max papers argument
-    max_papers = 15
-    for arg in sys.argv:
-        if arg.startswith("--max="):
-            try:
-                max_papers = int(arg.split("=")[1])
-            except ValueError:
-                pass
-    
     # Run the pipeline
     stats = run_daily_pipeline(
-        days_back=days_back,
-        max_papers=max_papers,
-        dry_run=dry_run,
+        days_back=args.days,
+        max_papers=args.max,
+        dry_run=args.dry_run,
+        lightweight=args.lightweight,
     )
     
     # Exit with error code if there were errors
@@ -6,9 +6,13 @@ Uses the official Notion API.
 """
 
 import os
+import asyncio
+import aiohttp
+import orjson
 import requests
 from datetime import datetime
-from typing import Optional
+from itertools import chain, islice
+from typing import Iterator, Optional
 from dataclasses import dataclass
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -20,6 +24,12 @@ from .arxiv_fetcher import CATEGORY_NAMES
 NOTION_API_BASE = "https://api.notion.com/v1"
 NOTION_API_VERSION = "2022-06-28"
 
+# Maximum number of conditions per compound filter / results per query page
+NOTION_PAGE_SIZE = 100
+
+# Maximum number of concurrent requests to the Notion API
+MAX_CONCURRENT_REQUESTS = 3
+
 
 # Category code to Notion select value mapping
 CATEGORY_TO_SELECT = {
@@ -30,6 +40,43 @@ CATEGORY_TO_SELECT = {
     "cs.RO": "Robotics",
 }
 
+# Database property name, Notion property type, and value getter for each paper field
+FIELD_SPECS = [
+    ("Title", "title", lambda p: p.paper.title),
+    ("Authors", "rich_text", lambda p: p.paper.authors_string),
+    ("Category", "select", lambda p: CATEGORY_TO_SELECT.get(p.paper.primary_category, "Machine Learning")),
+    ("Date", "date", lambda p: p.paper.published.strftime("%Y-%m-%d")),
+    ("Innovation Score", "number", lambda p: p.innovation_score),
+    ("Summary", "rich_text", lambda p: p.summary),
+    ("Key Innovation", "rich_text", lambda p: p.key_innovation),
+    ("Implementation Details", "rich_text", lambda p: p.implementation_details),
+    ("arXiv Link", "url", lambda p: p.paper.arxiv_url),
+    ("PDF Link", "url", lambda p: p.paper.pdf_url),
+    ("arXiv ID", "rich_text", lambda p: p.paper.arxiv_id),
+]
+
+
+# Markdown line prefix to (Notion block type, prefix length) mapping
+PREFIX_DISPATCH = {
+    "### ": ("heading_3", 4),
+    "## ": ("heading_2", 3),
+    "# ": ("heading_1", 2),
+    "- ": ("bulleted_list_item", 2),
+    "* ": ("bulleted_list_item", 2),
+    "> ": ("quote", 2),
+}
+
+
+def _make_block(block_type: str, content: str) -> dict:
+    """Build a Notion text block of the given type."""
+    return {
+        "object": "block",
+        "type": block_type,
+        block_type: {
+            "rich_text": [{"type": "text", "text": {"content": content}}]
+        }
+    }
+
 
 class NotionClient:
     """Client for interacting with Notion API."""
@@ -60,6 +107,14 @@ class NotionClient:
             "Content-Type": "application/json",
             "Notion-Version": NOTION_API_VERSION,
         }
+        
+        # Reuse keep-alive connections across all synchronous Notion calls
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        
+        # Bounds concurrent async inserts; created per event loop by _request_semaphore
+        self._semaphore: Optional[asyncio.BoundedSemaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
     
     @retry(
         stop=stop_after_attempt(3),
@@ -78,71 +133,15 @@ class NotionClient:
         if not self.database_id:
             raise ValueError("NOTION_DATABASE_ID is required to add papers")
         
-        # Check if paper already exists
-        if self._paper_exists(paper.paper.arxiv_id):
-            print(f"Paper {paper.paper.arxiv_id} already exists, skipping...")
-            return None
-        
-        # Get category select value
-        category = CATEGORY_TO_SELECT.get(
-            paper.paper.primary_category,
-            "Machine Learning"  # Default fallback
-        )
-        
-        # Truncate text fields to Notion's limits (2000 chars for rich_text)
-        summary = self._truncate(paper.summary, 2000)
-        key_innovation = self._truncate(paper.key_innovation, 2000)
-        implementation = self._truncate(paper.implementation_details, 2000)
-        authors = self._truncate(", ".join(paper.paper.authors), 2000)
+        payload = self._build_payload(paper)
         
-        # Build the request payload
-        payload = {
-            "parent": {"database_id": self.database_id},
-            "properties": {
-                "Title": {
-                    "title": [{"text": {"content": self._truncate(paper.paper.title, 2000)}}]
-                },
-                "Authors": {
-                    "rich_text": [{"text": {"content": authors}}]
-                },
-                "Category": {
-                    "select": {"name": category}
-                },
-                "Date": {
-                    "date": {"start": paper.paper.published.strftime("%Y-%m-%d")}
-                },
-                "Innovation Score": {
-                    "number": paper.innovation_score
-                },
-                "Summary": {
-                    "rich_text": [{"text": {"content": summary}}]
-                },
-                "Key Innovation": {
-                    "rich_text": [{"text": {"content": key_innovation}}]
-                },
-                "Implementation Details": {
-                    "rich_text": [{"text": {"content": implementation}}]
-                },
-                "arXiv Link": {
-                    "url": paper.paper.arxiv_url
-                },
-                "PDF Link": {
-                    "url": paper.paper.pdf_url
-                },
-                "arXiv ID": {
-                    "rich_text": [{"text": {"content": paper.paper.arxiv_id}}]
-                },
-            }
-        }
-        
-        response = requests.post(
+        response = self.session.post(
             f"{NOTION_API_BASE}/pages",
-            headers=self.headers,
-            json=payload,
+            data=orjson.dumps(payload),
         )
         
         if response.status_code == 200:
-            page_id = response.json().get("id")
+            page_id = orjson.loads(response.content).get("id")
             print(f"Added paper: {paper.paper.title[:50]}...")
             return page_id
         else:
@@ -150,6 +149,100 @@ class NotionClient:
             print(f"Response: {response.text}")
             return None
     
+    def _build_payload(self, paper: AnalyzedPaper) -> dict:
+        """Build the Notion page-create payload for an analyzed paper."""
+        return {
+            "parent": {"database_id": self.database_id},
+            "properties": {
+                name: self._property_value(prop_type, getter(paper))
+                for name, prop_type, getter in FIELD_SPECS
+            },
+        }
+    
+    def _property_value(self, prop_type: str, value) -> dict:
+        """Build a Notion property value of the given type."""
+        if prop_type in ("title", "rich_text"):
+            # Truncate text fields to Notion's limits (2000 chars for rich_text)
+            return {prop_type: [{"text": {"content": self._truncate(value, 2000)}}]}
+        if prop_type == "select":
+            return {"select": {"name": value}}
+        if prop_type == "date":
+            return {"date": {"start": value}}
+        return {prop_type: value}
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+    )
+    async def _create_page_async(
+        self,
+        session: aiohttp.ClientSession,
+        paper: AnalyzedPaper,
+    ) -> Optional[str]:
+        """Create a database page for a paper without blocking the event loop."""
+        if not self.database_id:
+            raise ValueError("NOTION_DATABASE_ID is required to add papers")
+        
+        payload = self._build_payload(paper)
+        
+        async with session.post(f"{NOTION_API_BASE}/pages", data=orjson.dumps(payload)) as response:
+            if response.status == 200:
+                page_id = orjson.loads(await response.read()).get("id")
+                print(f"Added paper: {paper.paper.title[:50]}...")
+                return page_id
+            
+            # Rate limited - raise so tenacity backs off and retries
+            if response.status == 429:
+                response.raise_for_status()
+            
+            print(f"Error adding paper {paper.paper.arxiv_id}: {response.status}")
+            print(f"Response: {await response.text()}")
+            return None
+    
+    def _request_semaphore(self) -> asyncio.BoundedSemaphore:
+        """Return the semaphore limiting async Notion requests on the running loop."""
+        loop = asyncio.get_running_loop()
+        # Each asyncio.run starts a new loop, and a semaphore can't be shared across loops
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)  # Notion allows ~3 req/s
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    def create_session(self) -> aiohttp.ClientSession:
+        """Create an aiohttp session authenticated for the Notion API."""
+        return aiohttp.ClientSession(headers=self.headers)
+    
+    async def add_paper_async(
+        self,
+        session: aiohttp.ClientSession,
+        paper: AnalyzedPaper,
+    ) -> Optional[str]:
+        """
+        Add an analyzed paper to the Notion database from async code.
+        
+        Args:
+            session: Session created with create_session
+            paper: The analyzed paper to add
+            
+        Returns:
+            The page ID if successful, None otherwise
+        """
+        try:
+            async with self._request_semaphore():
+                return await self._create_page_async(session, paper)
+        except Exception as e:
+            print(f"Error adding paper {paper.paper.arxiv_id}: {e}")
+            return None
+    
+    async def _add_all(self, papers: list[AnalyzedPaper]) -> list[str]:
+        """Create database pages for all papers concurrently."""
+        async with self.create_session() as session:
+            results = await asyncio.gather(
+                *[self.add_paper_async(session, p) for p in papers]
+            )
+        
+        return [page_id for page_id in results if page_id]
+    
     def add_papers_to_database(self, papers: list[AnalyzedPaper]) -> list[str]:
         """
         Add multiple papers to the database.
@@ -160,15 +253,14 @@ class NotionClient:
         Returns:
             List of page IDs for successfully added papers
         """
-        page_ids = []
+        # Check which papers already exist with a single batched query
+        existing = self._existing_arxiv_ids([p.paper.arxiv_id for p in papers])
         for paper in papers:
-            try:
-                page_id = self.add_paper_to_database(paper)
-                if page_id:
-                    page_ids.append(page_id)
-            except Exception as e:
-                print(f"Error adding paper {paper.paper.arxiv_id}: {e}")
-                continue
+            if paper.paper.arxiv_id in existing:
+                print(f"Paper {paper.paper.arxiv_id} already exists, skipping...")
+        papers = [p for p in papers if p.paper.arxiv_id not in existing]
+        
+        page_ids = asyncio.run(self._add_all(papers))
         
         print(f"Added {len(page_ids)} papers to database")
         return page_ids
@@ -197,28 +289,54 @@ class NotionClient:
         if not self.parent_page_id:
             raise ValueError("NOTION_PARENT_PAGE_ID is required to create summary pages")
         
-        # Build the page content
-        content_blocks = self._markdown_to_blocks(summary_content)
+        # Build the page content: the summary, then a section with links to
+        # individual papers, stopping at Notion's 100-block limit
+        content_blocks = islice(
+            chain(
+                self._markdown_to_blocks(summary_content),
+                [
+                    _make_block("heading_2", "Papers Analyzed Today"),
+                    {
+                        "object": "block",
+                        "type": "divider",
+                        "divider": {}
+                    },
+                ],
+                self._paper_link_blocks(papers[:20]),  # Limit to avoid too long pages
+            ),
+            100,  # Notion API limit
+        )
         
-        # Add a section with links to individual papers
-        content_blocks.extend([
-            {
-                "object": "block",
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [{"type": "text", "text": {"content": "Papers Analyzed Today"}}]
+        # Create the page
+        payload = {
+            "parent": {"page_id": self.parent_page_id},
+            "icon": {"type": "emoji", "emoji": "📚"},
+            "properties": {
+                "title": {
+                    "title": [{"text": {"content": f"Daily Summary - {date_str}"}}]
                 }
             },
-            {
-                "object": "block",
-                "type": "divider",
-                "divider": {}
-            }
-        ])
+            "children": list(content_blocks),
+        }
         
-        # Add paper links as bullet points
-        for paper in papers[:20]:  # Limit to avoid too long pages
-            content_blocks.append({
+        response = self.session.post(
+            f"{NOTION_API_BASE}/pages",
+            data=orjson.dumps(payload),
+        )
+        
+        if response.status_code == 200:
+            page_id = orjson.loads(response.content).get("id")
+            print(f"Created daily summary page for {date_str}")
+            return page_id
+        else:
+            print(f"Error creating summary page: {response.status_code}")
+            print(f"Response: {response.text}")
+            return None
+    
+    def _paper_link_blocks(self, papers: list[AnalyzedPaper]) -> Iterator[dict]:
+        """Yield a bulleted link block for each paper."""
+        for paper in papers:
+            yield {
                 "object": "block",
                 "type": "bulleted_list_item",
                 "bulleted_list_item": {
@@ -239,34 +357,7 @@ class NotionClient:
                         }
                     ]
                 }
-            })
-        
-        # Create the page
-        payload = {
-            "parent": {"page_id": self.parent_page_id},
-            "icon": {"type": "emoji", "emoji": "📚"},
-            "properties": {
-                "title": {
-                    "title": [{"text": {"content": f"Daily Summary - {date_str}"}}]
-                }
-            },
-            "children": content_blocks[:100]  # Notion API limit
-        }
-        
-        response = requests.post(
-            f"{NOTION_API_BASE}/pages",
-            headers=self.headers,
-            json=payload,
-        )
-        
-        if response.status_code == 200:
-            page_id = response.json().get("id")
-            print(f"Created daily summary page for {date_str}")
-            return page_id
-        else:
-            print(f"Error creating summary page: {response.status_code}")
-            print(f"Response: {response.text}")
-            return None
+            }
     
     def _paper_exists(self, arxiv_id: str) -> bool:
         """Check if a paper already exists in the database."""
@@ -277,138 +368,129 @@ class NotionClient:
             "filter": {
                 "property": "arXiv ID",
                 "rich_text": {"equals": arxiv_id}
-            }
+            },
+            "page_size": 1,  # A single match is enough to answer the question
         }
         
-        response = requests.post(
+        response = self.session.post(
             f"{NOTION_API_BASE}/databases/{self.database_id}/query",
-            headers=self.headers,
-            json=payload,
+            data=orjson.dumps(payload),
         )
         
         if response.status_code == 200:
-            results = response.json().get("results", [])
+            results = orjson.loads(response.content).get("results", [])
             return len(results) > 0
         
         return False
     
+    def _existing_arxiv_ids(self, ids: list[str]) -> set[str]:
+        """Return the subset of arXiv IDs that already exist in the database."""
+        if not self.database_id or not ids:
+            return set()
+        
+        try:
+            return self._query_existing_arxiv_ids(ids)
+        except Exception as e:
+            # Treat every paper as new rather than failing the whole run
+            print(f"Error querying existing papers: {e}")
+            return set()
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+    )
+    def _query_existing_arxiv_ids(self, ids: list[str]) -> set[str]:
+        """Query the database for existing arXiv IDs, a compound filter per chunk."""
+        existing = set()
+        for i in range(0, len(ids), NOTION_PAGE_SIZE):
+            chunk = ids[i:i + NOTION_PAGE_SIZE]
+            payload = {
+                "filter": {
+                    "or": [
+                        {"property": "arXiv ID", "rich_text": {"equals": arxiv_id}}
+                        for arxiv_id in chunk
+                    ]
+                },
+                "page_size": NOTION_PAGE_SIZE,
+            }
+            
+            while True:
+                response = self.session.post(
+                    f"{NOTION_API_BASE}/databases/{self.database_id}/query",
+                    data=orjson.dumps(payload),
+                )
+                
+                # Rate limited - raise so tenacity backs off and retries
+                if response.status_code == 429:
+                    response.raise_for_status()
+                
+                if response.status_code != 200:
+                    print(f"Error querying existing papers: {response.status_code}")
+                    break
+                
+                data = orjson.loads(response.content)
+                for page in data.get("results", []):
+                    rich_text = page["properties"].get("arXiv ID", {}).get("rich_text", [])
+                    if rich_text:
+                        existing.add(rich_text[0]["plain_text"])
+                
+                if not data.get("has_more"):
+                    break
+                payload["start_cursor"] = data["next_cursor"]
+        
+        return existing
+    
     def _truncate(self, text: str, max_length: int) -> str:
         """Truncate text to max length."""
         if len(text) <= max_length:
             return text
         return text[:max_length - 3] + "..."
     
-    def _markdown_to_blocks(self, markdown: str) -> list[dict]:
+    def _markdown_to_blocks(self, markdown: str) -> Iterator[dict]:
         """
-        Convert markdown text to Notion blocks.
+        Convert markdown text to Notion blocks, yielding them lazily.
         This is a simplified converter that handles basic markdown.
         """
-        blocks = []
-        lines = markdown.split("\n")
-        
-        i = 0
-        while i < len(lines):
-            line = lines[i]
+        for line in markdown.split("\n"):
+            stripped = line.strip()
             
             # Skip empty lines
-            if not line.strip():
-                i += 1
+            if not stripped:
                 continue
             
-            # Heading 1
-            if line.startswith("# "):
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_1",
-                    "heading_1": {
-                        "rich_text": [{"type": "text", "text": {"content": line[2:].strip()}}]
-                    }
-                })
-            
-            # Heading 2
-            elif line.startswith("## "):
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_2",
-                    "heading_2": {
-                        "rich_text": [{"type": "text", "text": {"content": line[3:].strip()}}]
-                    }
-                })
-            
-            # Heading 3
-            elif line.startswith("### "):
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_3",
-                    "heading_3": {
-                        "rich_text": [{"type": "text", "text": {"content": line[4:].strip()}}]
-                    }
-                })
-            
-            # Bullet list
-            elif line.startswith("- ") or line.startswith("* "):
-                blocks.append({
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [{"type": "text", "text": {"content": line[2:].strip()}}]
-                    }
-                })
-            
-            # Numbered list
-            elif len(line) > 2 and line[0].isdigit() and line[1] == ".":
-                blocks.append({
-                    "object": "block",
-                    "type": "numbered_list_item",
-                    "numbered_list_item": {
-                        "rich_text": [{"type": "text", "text": {"content": line[2:].strip()}}]
-                    }
-                })
-            
-            # Divider
-            elif line.strip() in ("---", "***", "___"):
-                blocks.append({
-                    "object": "block",
-                    "type": "divider",
-                    "divider": {}
-                })
-            
-            # Quote
-            elif line.startswith("> "):
-                blocks.append({
-                    "object": "block",
-                    "type": "quote",
-                    "quote": {
-                        "rich_text": [{"type": "text", "text": {"content": line[2:].strip()}}]
-                    }
-                })
-            
-            # Regular paragraph
+            # Headings, bullets and quotes
+            for prefix, (block_type, offset) in PREFIX_DISPATCH.items():
+                if line.startswith(prefix):
+                    yield _make_block(block_type, line[offset:].strip())
+                    break
             else:
-                blocks.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [{"type": "text", "text": {"content": line.strip()}}]
+                # Numbered list
+                if len(line) > 2 and line[0].isdigit() and line[1] == ".":
+                    yield _make_block("numbered_list_item", line[2:].strip())
+                
+                # Divider
+                elif stripped in ("---", "***", "___"):
+                    yield {
+                        "object": "block",
+                        "type": "divider",
+                        "divider": {}
                     }
-                })
-            
-            i += 1
-        
-        return blocks
+                
+                # Regular paragraph
+                else:
+                    yield _make_block("paragraph", stripped)
     
     def get_database_info(self) -> Optional[dict]:
         """Get information about the papers database."""
         if not self.database_id:
             return None
         
-        response = requests.get(
+        response = self.session.get(
             f"{NOTION_API_BASE}/databases/{self.database_id}",
-            headers=self.headers,
         )
         
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         return None
 
 
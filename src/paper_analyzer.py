@@ -4,17 +4,156 @@ Paper Analyzer Module
 Uses Claude to analyze, rank, and summarize arXiv papers by innovation.
 """
 
+import io
 import os
+import re
 import json
-from typing import Optional
+import functools
+import operator
+import asyncio
+import string
+import threading
+from collections import defaultdict
+from typing import AsyncIterator, Optional
 from dataclasses import dataclass
-from anthropic import Anthropic
-from tenacity import retry, stop_after_attempt, wait_exponential
+from anthropic import (
+    Anthropic,
+    APIConnectionError,
+    APIStatusError,
+    DefaultHttpxClient,
+    RateLimitError,
+    Timeout,
+)
+from anthropic.types import Message
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 from .arxiv_fetcher import Paper, CATEGORY_NAMES
+from .analysis_cache import AnalysisCache
 
 
-@dataclass
+# Number of papers analyzed together in one detailed-analysis request
+ANALYSIS_BATCH_SIZE = 5
+
+# Maximum number of Claude requests in flight at once
+MAX_CONCURRENT_REQUESTS = 8
+
+# Output token budget per paper in a detailed-analysis batch
+ANALYSIS_TOKENS_PER_PAPER = 1024
+
+# Static ranking instructions, sent as the system prompt
+RANK_INSTRUCTIONS = """You are an AI research expert tasked with identifying the most innovative and impactful papers from today's arXiv submissions.
+
+You will be given recent papers from arXiv. Select the most innovative papers based on:
+
+1. **Novelty**: Does it introduce genuinely new ideas, methods, or perspectives?
+2. **Technical Contribution**: Is the technical approach sophisticated and well-designed?
+3. **Potential Impact**: Could this significantly influence the field or enable new applications?
+4. **Practical Value**: Does it solve real problems or enable new capabilities?"""
+
+# Tool schema Claude fills in with its ranking of the papers
+RANK_TOOL = {
+    "name": "rank_papers",
+    "description": "Record the most innovative papers, ordered from most to least innovative.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "ranked_ids": {
+                "type": "array",
+                "items": {"type": "string", "description": "An arXiv ID, e.g. 2411.12345"},
+            },
+        },
+        "required": ["ranked_ids"],
+    },
+}
+
+# Ranking request that follows the paper list
+RANK_DIRECTIVE = string.Template("""Analyze the $count papers above and select the $top_n MOST INNOVATIVE papers.
+
+Record the arXiv IDs of the top $top_n most innovative papers with the rank_papers tool, ordered from most to least innovative.""")
+
+# Static detailed-analysis instructions, sent as the system prompt
+ANALYSIS_INSTRUCTIONS = """You are an AI research expert writing detailed analyses of arXiv papers.
+
+Record one analysis per paper with the record_analyses tool, using each paper's ARXIV ID as its id.
+Be specific and technical in your analysis."""
+
+# Tool schema Claude fills in with the detailed analysis of each paper
+ANALYSIS_TOOL = {
+    "name": "record_analyses",
+    "description": "Record a detailed analysis for each paper.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "analyses": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "string", "description": "The paper's arXiv ID"},
+                        "innovation_score": {"type": "integer", "description": "1-10 integer rating"},
+                        "summary": {"type": "string", "description": "2-3 sentence executive summary"},
+                        "problem_solved": {"type": "string", "description": "What problem does this paper address?"},
+                        "key_innovation": {"type": "string", "description": "What is the main novel contribution?"},
+                        "implementation_details": {"type": "string", "description": "How did they implement/achieve this? Key technical details"},
+                        "potential_impact": {"type": "string", "description": "What is the potential impact on the field?"},
+                    },
+                    "required": [
+                        "id",
+                        "innovation_score",
+                        "summary",
+                        "problem_solved",
+                        "key_innovation",
+                        "implementation_details",
+                        "potential_impact",
+                    ],
+                },
+            },
+        },
+        "required": ["analyses"],
+    },
+}
+
+# Fields a recorded analysis must contain to be used and cached
+ANALYSIS_FIELDS = frozenset(ANALYSIS_TOOL["input_schema"]["properties"]["analyses"]["items"]["required"])
+
+# Opening line of a detailed-analysis request, followed by the papers
+ANALYSIS_PROMPT_HEADER = string.Template(
+    "Analyze each of these $count arXiv papers and provide a detailed summary of each:\n\n"
+)
+
+# Opening of the daily summary request, followed by the papers by category
+SUMMARY_PROMPT_HEADER = string.Template("""Create an engaging executive summary for today's most innovative AI research papers.
+
+Date: $date
+Total Papers Analyzed: $count
+
+PAPERS BY CATEGORY:
+""")
+
+# Closing instructions of the daily summary request
+SUMMARY_PROMPT_FOOTER = """
+
+Generate a Notion-flavored Markdown summary with:
+1. A brief executive overview (2-3 sentences about today's trends)
+2. Top 3 most exciting papers with why they matter
+3. Category-by-category highlights
+4. Key themes and emerging trends observed
+
+Make it engaging and insightful for researchers and practitioners. Use markdown formatting.
+Return ONLY the markdown content, no code blocks."""
+
+# Error types in a mid-stream error event that are worth retrying
+TRANSIENT_STREAM_ERROR_TYPES = {"overloaded_error", "api_error"}
+
+# Sort keys for ordering analyzed papers
+_BY_SCORE = operator.attrgetter("innovation_score")
+_BY_ARXIV_ID = operator.attrgetter("paper.arxiv_id")
+
+# A response wrapped entirely in a markdown code fence (e.g. ```markdown ... ```)
+_FENCE_RE = re.compile(r"^```(?:\w+)?\s*(.*?)\s*```$", re.DOTALL)
+
+
+@dataclass(slots=True)
 class AnalyzedPaper:
     """A paper that has been analyzed by Claude."""
     
@@ -39,6 +178,47 @@ class AnalyzedPaper:
         }
 
 
+def sort_by_score(analyzed_papers: list[AnalyzedPaper]) -> None:
+    """Sort analyzed papers in place, highest innovation score first, ties by arXiv ID."""
+    # list.sort is stable, so the ID order survives among equal scores
+    analyzed_papers.sort(key=_BY_ARXIV_ID)
+    analyzed_papers.sort(key=_BY_SCORE, reverse=True)
+
+
+def _is_transient_error(error: BaseException) -> bool:
+    """Whether an API error is worth retrying (network, rate limit, or server side)."""
+    if isinstance(error, (APIConnectionError, RateLimitError)):
+        return True
+    if not isinstance(error, APIStatusError):
+        return False
+    if error.status_code >= 500:
+        return True
+    # Errors sent mid-stream arrive with the stream's 200 status, so check their type
+    details = error.body.get("error") if isinstance(error.body, dict) else None
+    return isinstance(details, dict) and details.get("type") in TRANSIENT_STREAM_ERROR_TYPES
+
+
+def _strip_fence(text: str) -> str:
+    """Remove a code fence wrapped around the whole response, if present."""
+    text = text.strip()
+    m = _FENCE_RE.match(text)
+    return m.group(1) if m else text
+
+
+def _dedupe_papers(papers: list[Paper]) -> list[Paper]:
+    """Drop repeated papers (e.g. cross-listings), keeping the first of each arXiv ID."""
+    unique: dict[str, Paper] = {}
+    for p in papers:
+        unique.setdefault(p.arxiv_id.split('v', 1)[0], p)
+    return list(unique.values())
+
+
+@functools.lru_cache(maxsize=64)
+def _cat_name(category: str) -> str:
+    """Get the human-readable name for a category code."""
+    return CATEGORY_NAMES.get(category, category)
+
+
 class PaperAnalyzer:
     """Analyzes papers using Claude to identify the most innovative ones."""
     
@@ -46,6 +226,7 @@ class PaperAnalyzer:
         self,
         api_key: str = None,
         model: str = None,
+        cache: AnalysisCache = None,
     ):
         """
         Initialize the paper analyzer.
@@ -53,18 +234,42 @@ class PaperAnalyzer:
         Args:
             api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY env var)
             model: Claude model to use (defaults to CLAUDE_MODEL env var or claude-sonnet-4-20250514)
+            cache: Cache of previous Claude results (defaults to one under .cache/)
         """
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable is required")
         
         self.model = model or os.getenv("CLAUDE_MODEL", "claude-sonnet-4-20250514")
-        self.client = Anthropic(api_key=self.api_key)
+        # One pooled HTTP/2 client so ranking, analysis and summary calls
+        # share connections instead of paying a TLS handshake each time
+        self.client = Anthropic(
+            api_key=self.api_key,
+            http_client=DefaultHttpxClient(
+                http2=True,
+                timeout=Timeout(60.0, connect=10.0),
+            ),
+        )
+        self.cache = cache or AnalysisCache()
+        
+        # Bounds concurrent Claude requests to respect per-key concurrency limits
+        self._api_semaphore = threading.Semaphore(MAX_CONCURRENT_REQUESTS)
     
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception(_is_transient_error),
     )
+    def _call_with_retry(self, **kwargs) -> Message:
+        """
+        Send a Claude request, retrying only transient API failures.
+        
+        The response is streamed so it is received while it is generated.
+        """
+        with self._api_semaphore:
+            with self.client.messages.stream(**kwargs) as stream:
+                return stream.get_final_message()
+    
     def analyze_papers(
         self,
         papers: list[Paper],
@@ -73,6 +278,8 @@ class PaperAnalyzer:
         """
         Analyze papers and return the most innovative ones with summaries.
         
+        Collects analyze_papers_stream, so both entry points share one pipeline.
+        
         Args:
             papers: List of papers to analyze
             max_papers: Maximum number of top papers to return
@@ -80,35 +287,76 @@ class PaperAnalyzer:
         Returns:
             List of AnalyzedPaper objects, sorted by innovation score
         """
+        async def collect() -> list[AnalyzedPaper]:
+            return [ap async for ap in self.analyze_papers_stream(papers, max_papers)]
+        
+        analyzed_papers = asyncio.run(collect())
+        
+        # Sort by innovation score (highest first)
+        sort_by_score(analyzed_papers)
+        
+        return analyzed_papers
+    
+    async def analyze_papers_stream(
+        self,
+        papers: list[Paper],
+        max_papers: int = 15,
+    ) -> AsyncIterator[AnalyzedPaper]:
+        """
+        Analyze papers, yielding each top paper as soon as its analysis completes.
+        
+        Args:
+            papers: List of papers to analyze
+            max_papers: Maximum number of top papers to yield
+            
+        Yields:
+            AnalyzedPaper objects in completion order (not sorted by score)
+        """
         if not papers:
-            return []
+            return
         
+        papers = _dedupe_papers(papers)
         print(f"Analyzing {len(papers)} papers with Claude...")
         
         # First pass: rank papers by innovation
+        top_papers = await asyncio.to_thread(self._select_top_papers, papers, max_papers)
+        
+        cached, top_papers = self._split_cached(top_papers)
+        for analysis in cached:
+            yield analysis
+        
+        # Second pass: analyze batches concurrently in worker threads,
+        # yielding each batch's papers as soon as that batch completes
+        async def analyze(batch: list[Paper]) -> list[AnalyzedPaper]:
+            try:
+                return await asyncio.to_thread(self._analyze_papers_batch, batch)
+            except Exception as e:
+                print(f"Error analyzing papers {', '.join(p.arxiv_id for p in batch)}: {e}")
+                return []
+        
+        for next_done in asyncio.as_completed([analyze(b) for b in self._batches(top_papers)]):
+            for analysis in await next_done:
+                yield analysis
+    
+    def _select_top_papers(
+        self,
+        papers: list[Paper],
+        max_papers: int,
+    ) -> list[Paper]:
+        """Rank papers with Claude and return the top papers in ranked order."""
         ranked_paper_ids = self._rank_papers_by_innovation(papers, max_papers)
         
         # Get the top papers - match by ID prefix (without version suffix)
         # Claude may return "2511.21692" but paper.arxiv_id is "2511.21692v1"
-        paper_map = {p.arxiv_id: p for p in papers}
-        paper_map_no_version = {p.arxiv_id.split('v')[0]: p for p in papers}
+        paper_map = {}
+        for p in papers:
+            paper_map[p.arxiv_id] = p
+            paper_map.setdefault(p.arxiv_id.split('v', 1)[0], p)
         
-        top_papers = []
-        for pid in ranked_paper_ids:
-            if pid in paper_map:
-                top_papers.append(paper_map[pid])
-            elif pid in paper_map_no_version:
-                top_papers.append(paper_map_no_version[pid])
+        top_papers = [paper_map[pid] for pid in ranked_paper_ids if pid in paper_map]
         
         print(f"Selected {len(top_papers)} most innovative papers for detailed analysis")
-        
-        # Second pass: generate detailed summaries for top papers
-        analyzed_papers = self._generate_detailed_summaries(top_papers)
-        
-        # Sort by innovation score (highest first)
-        analyzed_papers.sort(key=lambda p: p.innovation_score, reverse=True)
-        
-        return analyzed_papers
+        return top_papers
     
     def _rank_papers_by_innovation(
         self,
@@ -117,160 +365,161 @@ class PaperAnalyzer:
     ) -> list[str]:
         """Use Claude to rank papers by innovation and return top N paper IDs."""
         
+        cache_key = AnalysisCache.make_key(
+            self.model, "rank", str(top_n), *sorted(p.arxiv_id for p in papers)
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
+        
         # Prepare papers summary for Claude
         papers_text = self._format_papers_for_ranking(papers)
         
-        prompt = f"""You are an AI research expert tasked with identifying the most innovative and impactful papers from today's arXiv submissions.
-
-Below are {len(papers)} recent papers from arXiv. Analyze them and select the {top_n} MOST INNOVATIVE papers based on:
+        directive = RANK_DIRECTIVE.safe_substitute(count=len(papers), top_n=top_n)
 
-1. **Novelty**: Does it introduce genuinely new ideas, methods, or perspectives?
-2. **Technical Contribution**: Is the technical approach sophisticated and well-designed?
-3. **Potential Impact**: Could this significantly influence the field or enable new applications?
-4. **Practical Value**: Does it solve real problems or enable new capabilities?
-
-PAPERS TO ANALYZE:
-{papers_text}
-
-IMPORTANT: Return ONLY a JSON array of arXiv IDs for the top {top_n} most innovative papers, ordered from most to least innovative.
-
-Example format:
-["2411.12345", "2411.67890", "2411.11111"]
-
-Return ONLY the JSON array, no other text."""
-
-        response = self.client.messages.create(
+        response = self._call_with_retry(
             model=self.model,
             max_tokens=1024,
-            messages=[{"role": "user", "content": prompt}],
+            system=RANK_INSTRUCTIONS,
+            tools=[RANK_TOOL],
+            tool_choice={"type": "tool", "name": RANK_TOOL["name"]},
+            messages=[{
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": f"PAPERS TO ANALYZE:\n{papers_text}"},
+                    {"type": "text", "text": directive},
+                ],
+            }],
         )
         
-        response_text = response.content[0].text.strip()
-        
-        # Parse the JSON response
-        try:
-            # Handle potential markdown code blocks
-            if "```" in response_text:
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
-            
-            ranked_ids = json.loads(response_text)
-            return ranked_ids[:top_n]
-        except json.JSONDecodeError as e:
-            print(f"Error parsing Claude response: {e}")
-            print(f"Response was: {response_text}")
-            # Fallback: return first N papers
-            return [p.arxiv_id for p in papers[:top_n]]
+        tool_use = next(block for block in response.content if block.type == "tool_use")
+        ranked_ids = tool_use.input["ranked_ids"][:top_n]
+        # A ranking cut off at max_tokens may be missing IDs, so don't persist it
+        if response.stop_reason == "max_tokens":
+            print(f"Ranking response hit max_tokens; using {len(ranked_ids)} IDs without caching")
+        else:
+            self.cache.set(cache_key, json.dumps(ranked_ids))
+        return ranked_ids
     
     def _format_papers_for_ranking(self, papers: list[Paper]) -> str:
         """Format papers into a condensed text for ranking."""
-        lines = []
-        for paper in papers:
-            category_name = CATEGORY_NAMES.get(paper.primary_category, paper.primary_category)
-            # Truncate abstract for initial ranking
-            abstract_preview = paper.abstract[:500] + "..." if len(paper.abstract) > 500 else paper.abstract
-            lines.append(f"""
----
-ID: {paper.arxiv_id}
-Title: {paper.title}
-Category: {category_name}
-Authors: {', '.join(paper.authors[:5])}{'...' if len(paper.authors) > 5 else ''}
-Abstract: {abstract_preview}
----""")
-        return "\n".join(lines)
+        # Abstracts are truncated for the initial ranking (see Paper.abstract_preview)
+        buf = io.StringIO()
+        for i, paper in enumerate(papers):
+            if i:
+                buf.write("\n")
+            buf.write("\n---\nID: ")
+            buf.write(paper.arxiv_id)
+            buf.write("\nTitle: ")
+            buf.write(paper.title)
+            buf.write("\nCategory: ")
+            buf.write(_cat_name(paper.primary_category))
+            buf.write("\nAuthors: ")
+            buf.write(", ".join(paper.authors[:5]))
+            if len(paper.authors) > 5:
+                buf.write("...")
+            buf.write("\nAbstract: ")
+            buf.write(paper.abstract_preview)
+            buf.write("\n---")
+        return buf.getvalue()
     
-    def _generate_detailed_summaries(
-        self,
-        papers: list[Paper],
-    ) -> list[AnalyzedPaper]:
-        """Generate detailed summaries for selected papers."""
-        
-        analyzed = []
-        
-        for paper in papers:
-            try:
-                analysis = self._analyze_single_paper(paper)
-                analyzed.append(analysis)
-            except Exception as e:
-                print(f"Error analyzing paper {paper.arxiv_id}: {e}")
-                continue
-        
-        return analyzed
+    def _batches(self, papers: list[Paper]) -> list[list[Paper]]:
+        """Split papers into groups small enough to analyze in one request."""
+        return [
+            papers[i:i + ANALYSIS_BATCH_SIZE]
+            for i in range(0, len(papers), ANALYSIS_BATCH_SIZE)
+        ]
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
-    def _analyze_single_paper(self, paper: Paper) -> AnalyzedPaper:
-        """Generate detailed analysis for a single paper."""
-        
-        category_name = CATEGORY_NAMES.get(paper.primary_category, paper.primary_category)
+    def _analyze_papers_batch(self, papers: list[Paper]) -> list[AnalyzedPaper]:
+        """Generate detailed analyses for several papers with a single request."""
         
-        prompt = f"""Analyze this arXiv paper and provide a detailed summary:
-
-TITLE: {paper.title}
-AUTHORS: {', '.join(paper.authors)}
-CATEGORY: {category_name}
+        papers_text = "\n\n".join(
+            f"""[{i}]
 ARXIV ID: {paper.arxiv_id}
+TITLE: {paper.title}
+AUTHORS: {paper.authors_string}
+CATEGORY: {_cat_name(paper.primary_category)}
 
 ABSTRACT:
-{paper.abstract}
-
-Provide your analysis in the following JSON format:
-{{
-    "innovation_score": <1-10 integer rating>,
-    "summary": "<2-3 sentence executive summary>",
-    "problem_solved": "<What problem does this paper address?>",
-    "key_innovation": "<What is the main novel contribution?>",
-    "implementation_details": "<How did they implement/achieve this? Key technical details>",
-    "potential_impact": "<What is the potential impact on the field?>"
-}}
-
-Be specific and technical in your analysis. Return ONLY the JSON object."""
+{paper.abstract}"""
+            for i, paper in enumerate(papers, 1)
+        )
+        
+        prompt = ANALYSIS_PROMPT_HEADER.safe_substitute(count=len(papers)) + papers_text
 
-        response = self.client.messages.create(
+        response = self._call_with_retry(
             model=self.model,
-            max_tokens=1024,
+            max_tokens=ANALYSIS_TOKENS_PER_PAPER * len(papers),
+            system=ANALYSIS_INSTRUCTIONS,
+            tools=[ANALYSIS_TOOL],
+            tool_choice={"type": "tool", "name": ANALYSIS_TOOL["name"]},
             messages=[{"role": "user", "content": prompt}],
         )
         
-        response_text = response.content[0].text.strip()
+        tool_use = next(block for block in response.content if block.type == "tool_use")
+        analyses = {
+            a.get("id", "").split("v")[0]: a
+            for a in tool_use.input.get("analyses", [])
+        }
         
-        # Parse JSON response
-        try:
-            # Handle potential markdown code blocks
-            if "```" in response_text:
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
-            
-            analysis = json.loads(response_text)
-            
-            return AnalyzedPaper(
-                paper=paper,
-                innovation_score=int(analysis.get("innovation_score", 5)),
-                summary=analysis.get("summary", ""),
-                key_innovation=analysis.get("key_innovation", ""),
-                implementation_details=analysis.get("implementation_details", ""),
-                problem_solved=analysis.get("problem_solved", ""),
-                potential_impact=analysis.get("potential_impact", ""),
-            )
+        # The last analysis of a response cut off at max_tokens may be partial
+        # despite having every field, so nothing from it is cached
+        truncated = response.stop_reason == "max_tokens"
+        if truncated:
+            print(f"Analysis response hit max_tokens for {', '.join(p.arxiv_id for p in papers)}")
+        
+        analyzed = []
+        for paper in papers:
+            analysis = analyses.get(paper.arxiv_id.split("v")[0])
+            if analysis is None or not ANALYSIS_FIELDS.issubset(analysis):
+                print(f"No complete analysis returned for {paper.arxiv_id}")
+                analyzed.append(self._default_analysis(paper))
+                continue
             
-        except json.JSONDecodeError as e:
-            print(f"Error parsing analysis for {paper.arxiv_id}: {e}")
-            # Return with default values
-            return AnalyzedPaper(
-                paper=paper,
-                innovation_score=5,
-                summary=paper.abstract[:300] + "...",
-                key_innovation="See abstract for details",
-                implementation_details="See paper for technical details",
-                problem_solved="See abstract",
-                potential_impact="To be determined",
-            )
+            fields = {
+                "innovation_score": int(analysis["innovation_score"]),
+                "summary": analysis["summary"],
+                "key_innovation": analysis["key_innovation"],
+                "implementation_details": analysis["implementation_details"],
+                "problem_solved": analysis["problem_solved"],
+                "potential_impact": analysis["potential_impact"],
+            }
+            if not truncated:
+                self.cache.set(self._analysis_key(paper), json.dumps(fields))
+            analyzed.append(AnalyzedPaper(paper=paper, **fields))
+        
+        return analyzed
+    
+    def _analysis_key(self, paper: Paper) -> str:
+        """Cache key for a paper's analysis - analyses are deterministic per model and content."""
+        return AnalysisCache.make_key(self.model, paper.arxiv_id, paper.abstract)
+    
+    def _split_cached(self, papers: list[Paper]) -> tuple[list[AnalyzedPaper], list[Paper]]:
+        """Split papers into cached analyses and papers that still need analyzing."""
+        cached = []
+        uncached = []
+        for paper in papers:
+            hit = self.cache.get(self._analysis_key(paper))
+            if hit is None:
+                uncached.append(paper)
+            else:
+                cached.append(AnalyzedPaper(paper=paper, **json.loads(hit)))
+        
+        if cached:
+            print(f"Reusing {len(cached)} cached analyses")
+        return cached, uncached
+    
+    def _default_analysis(self, paper: Paper) -> AnalyzedPaper:
+        """Placeholder analysis for a paper Claude did not analyze."""
+        return AnalyzedPaper(
+            paper=paper,
+            innovation_score=5,
+            summary=paper.abstract[:300] + "...",
+            key_innovation="See abstract for details",
+            implementation_details="See paper for technical details",
+            problem_solved="See abstract",
+            potential_impact="To be determined",
+        )
     
     def generate_daily_summary(
         self,
@@ -283,48 +532,36 @@ Be specific and technical in your analysis. Return ONLY the JSON object."""
             return f"# ArXiv AI Research Summary - {date_str}\n\nNo significant papers found today."
         
         # Group papers by category
-        by_category: dict[str, list[AnalyzedPaper]] = {}
+        by_category: defaultdict[str, list[AnalyzedPaper]] = defaultdict(list)
         for ap in analyzed_papers:
-            cat = ap.paper.primary_category
-            if cat not in by_category:
-                by_category[cat] = []
-            by_category[cat].append(ap)
+            by_category[ap.paper.primary_category].append(ap)
         
-        prompt = f"""Create an engaging executive summary for today's most innovative AI research papers.
-
-Date: {date_str}
-Total Papers Analyzed: {len(analyzed_papers)}
-
-PAPERS BY CATEGORY:
-"""
+        parts = [SUMMARY_PROMPT_HEADER.safe_substitute(date=date_str, count=len(analyzed_papers))]
         for cat, papers in by_category.items():
-            cat_name = CATEGORY_NAMES.get(cat, cat)
-            prompt += f"\n## {cat_name}\n"
-            for ap in papers:
-                prompt += f"""
+            parts.append(f"\n## {_cat_name(cat)}\n")
+            parts.extend(
+                f"""
 - **{ap.paper.title}** (Score: {ap.innovation_score}/10)
   Key Innovation: {ap.key_innovation}
   Impact: {ap.potential_impact}
 """
+                for ap in papers
+            )
 
-        prompt += """
-
-Generate a Notion-flavored Markdown summary with:
-1. A brief executive overview (2-3 sentences about today's trends)
-2. Top 3 most exciting papers with why they matter
-3. Category-by-category highlights
-4. Key themes and emerging trends observed
-
-Make it engaging and insightful for researchers and practitioners. Use markdown formatting.
-Return ONLY the markdown content, no code blocks."""
+        parts.append(SUMMARY_PROMPT_FOOTER)
+        prompt = "".join(parts)
 
-        response = self.client.messages.create(
+        # The summary grows with the number of papers it covers
+        response = self._call_with_retry(
             model=self.model,
-            max_tokens=2048,
+            max_tokens=max(2048, min(4096, 512 + 80 * len(analyzed_papers))),
             messages=[{"role": "user", "content": prompt}],
         )
         
-        return response.content[0].text.strip()
+        if response.stop_reason == "max_tokens":
+            print("Warning: daily summary hit max_tokens and may be cut off")
+        
+        return _strip_fence(response.content[0].text)
 
 
 # For direct testing
@@ -0,0 +1,117 @@
+"""Tests for Claude error handling in the paper analyzer."""
+
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+from anthropic import APIStatusError, BadRequestError, InternalServerError
+
+from src.analysis_cache import AnalysisCache
+from src.arxiv_fetcher import Paper
+from src.paper_analyzer import PaperAnalyzer, _is_transient_error
+
+
+def _status_error(cls, status_code: int, error_type: str) -> APIStatusError:
+    """Build an API error as the SDK raises it for a response or stream event."""
+    body = {"type": "error", "error": {"type": error_type, "message": error_type}}
+    response = httpx.Response(
+        status_code,
+        request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"),
+    )
+    return cls(str(body), response=response, body=body)
+
+
+class TransientErrorTest(unittest.TestCase):
+    def test_mid_stream_overload_is_transient(self):
+        # Error events inside a stream carry the stream's HTTP 200 status
+        error = _status_error(APIStatusError, 200, "overloaded_error")
+        self.assertTrue(_is_transient_error(error))
+
+    def test_mid_stream_api_error_is_transient(self):
+        error = _status_error(APIStatusError, 200, "api_error")
+        self.assertTrue(_is_transient_error(error))
+
+    def test_mid_stream_request_error_is_not_transient(self):
+        error = _status_error(APIStatusError, 200, "invalid_request_error")
+        self.assertFalse(_is_transient_error(error))
+
+    def test_server_error_is_transient(self):
+        error = _status_error(InternalServerError, 500, "api_error")
+        self.assertTrue(_is_transient_error(error))
+
+    def test_bad_request_is_not_transient(self):
+        error = _status_error(BadRequestError, 400, "invalid_request_error")
+        self.assertFalse(_is_transient_error(error))
+
+    def test_call_with_retry_retries_mid_stream_overload(self):
+        analyzer = PaperAnalyzer(api_key="test-key", cache=AnalysisCache(":memory:"))
+        message = object()
+        stream = mock.MagicMock()
+        stream.__enter__.return_value.get_final_message.side_effect = [
+            _status_error(APIStatusError, 200, "overloaded_error"),
+            message,
+        ]
+
+        with mock.patch.object(analyzer.client.messages, "stream", return_value=stream), \
+                mock.patch.object(PaperAnalyzer._call_with_retry.retry, "sleep", lambda _: None):
+            self.assertIs(analyzer._call_with_retry(model="test", max_tokens=1, messages=[]), message)
+
+        self.assertEqual(stream.__enter__.return_value.get_final_message.call_count, 2)
+
+
+def _paper(arxiv_id: str) -> Paper:
+    now = datetime.now(timezone.utc)
+    return Paper(arxiv_id, "Title", ["Author"], "Abstract", ["cs.AI"], "cs.AI", now, now, "url", "pdf")
+
+
+def _analysis(arxiv_id: str) -> dict:
+    return {
+        "id": arxiv_id,
+        "innovation_score": 8,
+        "summary": "summary",
+        "problem_solved": "problem",
+        "key_innovation": "innovation",
+        "implementation_details": "details",
+        "potential_impact": "impact",
+    }
+
+
+def _tool_response(stop_reason: str, analyses: list[dict]) -> SimpleNamespace:
+    tool_use = SimpleNamespace(type="tool_use", input={"analyses": analyses})
+    return SimpleNamespace(stop_reason=stop_reason, content=[tool_use])
+
+
+class AnalysisCachingTest(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = PaperAnalyzer(api_key="test-key", cache=AnalysisCache(":memory:"))
+        self.papers = [_paper("2411.00001v1"), _paper("2411.00002v1")]
+
+    def test_incomplete_analysis_is_not_used_or_cached(self):
+        partial = {"id": "2411.00002", "innovation_score": 8, "summary": "abc"}
+        response = _tool_response("tool_use", [_analysis("2411.00001"), partial])
+
+        with mock.patch.object(self.analyzer, "_call_with_retry", return_value=response):
+            analyzed = self.analyzer._analyze_papers_batch(self.papers)
+
+        self.assertEqual(analyzed[0].summary, "summary")
+        self.assertEqual(analyzed[1], self.analyzer._default_analysis(self.papers[1]))
+        cached, uncached = self.analyzer._split_cached(self.papers)
+        self.assertEqual([ap.paper for ap in cached], [self.papers[0]])
+        self.assertEqual(uncached, [self.papers[1]])
+
+    def test_truncated_response_is_not_cached(self):
+        response = _tool_response("max_tokens", [_analysis("2411.00001"), _analysis("2411.00002")])
+
+        with mock.patch.object(self.analyzer, "_call_with_retry", return_value=response):
+            analyzed = self.analyzer._analyze_papers_batch(self.papers)
+
+        self.assertEqual(len(analyzed), 2)
+        cached, uncached = self.analyzer._split_cached(self.papers)
+        self.assertEqual(cached, [])
+        self.assertEqual(uncached, self.papers)
+
+
+if __name__ == "__main__":
+    unittest.main()